@@ -9,22 +9,65 @@ Usage:
     ANTHROPIC_API_KEY=sk-... python scripts/analyze.py
 
     Or set the env var in your shell profile.
+
+    Pass --batch to submit everything as one Message Batches job instead of
+    concurrent requests: half the cost, but results can take up to 24 hours.
+    If a --batch run is interrupted, the next --batch run collects the batch
+    it submitted (tracked in data/episodes-analyzed.batch.json) instead of
+    submitting another.
+    Pass --force to re-analyze episodes that already have an analysis.
+
+Analyses are also cached by content in data/.analysis-cache/, so unchanged
+episodes are not re-sent on later runs. --force skips that lookup and sends
+everything again, overwriting the cached analyses.
 """
 
+import asyncio
+import collections
+import hashlib
 import json
 import os
+import random
 import sys
 import time
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Optional, Tuple
 
 import anthropic
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
 INPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes.json")
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes-analyzed.json")
 USE_CASES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "use-cases.json")
+# Append-only log of analyses completed this run (one JSON object per line), so
+# progress is saved without rewriting OUTPUT_PATH; folded into it at the end
+PROGRESS_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes-analyzed.jsonl")
+# Id of a submitted --batch job and the cache file of each of its requests,
+# so an interrupted run collects that batch instead of paying for another
+BATCH_STATE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes-analyzed.batch.json")
+# Analyses keyed by a hash of everything sent to the model, reused across runs
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", ".analysis-cache")
 
 MODEL = "claude-sonnet-4-20250514"
-DELAY_SECONDS = 1  # Between API calls
+MAX_TOKENS = 4000
+# Description-only episodes are short inputs; a smaller model extracts them just as well
+FAST_MODEL = "claude-haiku-4-5-20251001"
+FAST_MAX_TOKENS = 3000
+MAX_INPUT_TOKENS = 40000  # Cost ceiling on transcript tokens sent per episode
+CHARS_PER_TOKEN = 3.5  # Conservative local estimate; overcounts English slightly
+PROMPT_VERSION = "v1"  # Bump when prompts or request params change to invalidate CACHE_DIR
+MAX_CONCURRENT = 8  # In-flight API calls
+BATCH_POLL_SECONDS = 60  # How often --batch checks whether the batch has ended
+INPUT_TOKENS_PER_MINUTE = 400000  # Stay under the account's input TPM limit
+MAX_ATTEMPTS = 5  # Per API call, including the first try
+RETRY_BASE_SECONDS = 2  # Backoff floor doubles with each retry
+# Timeout, conflict, rate limited and any 5xx (including 529 overloaded):
+# the same set the SDK's own retries cover
+RETRYABLE_STATUS = (408, 409, 429)
 
 SYSTEM_PROMPT = """You are an expert analyst specializing in practical AI workflows and use cases.
 You will be given content from "How I AI", a podcast/video series where guests share how they actually use AI in their work.
@@ -70,6 +113,76 @@ CONTENT:
 """
 
 
+def dump_json(data, pretty=False):
+    # type: (object, bool) -> bytes
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(path):
+    # type: (str) -> object
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def save_json(path, data, pretty=True):
+    # type: (str, object, bool) -> None
+    """Write JSON atomically: dump to a temp file, then swap it into place."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_json(data, pretty))
+    os.replace(tmp_path, path)
+
+
+def load_progress():
+    # type: () -> dict
+    """Read analyses logged to PROGRESS_PATH by an interrupted run, keyed by episode id."""
+    progress = {}
+    if not os.path.exists(PROGRESS_PATH):
+        return progress
+    with open(PROGRESS_PATH, "rb") as f:
+        for line in f:
+            try:
+                record = orjson.loads(line) if orjson else json.loads(line)
+            except ValueError:
+                continue  # Partial last line from a crash
+            progress[record["id"]] = record["analysis"]
+    return progress
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def parse_json_response(text):
+    # type: (str) -> dict
+    """Parse the JSON object in a model response.
+
+    Decoding starts at the first "{" and stops at the end of that object, so
+    markdown fences or trailing commentary around it are ignored.
+    """
+    start = text.find("{")
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object in response", text, 0)
+    return _JSON_DECODER.raw_decode(text, start)[0]
+
+
+def cache_path(model, content):
+    # type: (str, str) -> str
+    """Path of the cached analysis for this exact model + prompt + content combination.
+
+    `content` is the untruncated episode content; MAX_INPUT_TOKENS is part of
+    the key since it decides how much of it is actually sent.
+    """
+    parts = [PROMPT_VERSION, model, str(MAX_INPUT_TOKENS), SYSTEM_PROMPT, EXTRACTION_PROMPT, content]
+    key = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".json")
+
+
 def format_timestamped_transcript(episode):
     # type: (dict) -> str
     """Format transcript with approximate timestamp markers.
@@ -118,99 +231,399 @@ def format_timestamped_transcript(episode):
     return transcript or ""
 
 
-def analyze_episode(client, episode):
-    # type: (anthropic.Anthropic, dict) -> Optional[dict]
-    """Send a transcript (or description) to Claude and get structured analysis back."""
+class TokenRateLimiter:
+    """Sliding-window tokens-per-minute limiter shared by concurrent requests.
+
+    Each request reserves its estimated input tokens before it is sent; when the
+    last minute's reservations would exceed the cap, callers wait for the oldest
+    ones to age out of the window.
+    """
+
+    def __init__(self, tokens_per_minute):
+        # type: (int) -> None
+        self.tokens_per_minute = tokens_per_minute
+        self.window = collections.deque()  # (monotonic timestamp, tokens)
+        self.used = 0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens):
+        # type: (int) -> None
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.window and now - self.window[0][0] >= 60:
+                    self.used -= self.window.popleft()[1]
+                if not self.window or self.used + tokens <= self.tokens_per_minute:
+                    self.window.append((now, tokens))
+                    self.used += tokens
+                    return
+                await asyncio.sleep(60 - (now - self.window[0][0]))
+
+
+def retry_after_seconds(error):
+    # type: (anthropic.APIStatusError) -> float
+    """How long the API asked us to wait, from retry-after or the rate-limit reset header."""
+    headers = error.response.headers
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    reset = headers.get("anthropic-ratelimit-requests-reset")  # RFC 3339 timestamp
+    if reset:
+        try:
+            reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+            return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+        except ValueError:
+            pass
+    return 0.0
+
+
+async def create_with_retry(client, episode_id, **kwargs):
+    # type: (anthropic.AsyncAnthropic, str, **Any) -> anthropic.types.Message
+    """Call messages.create, backing off and retrying on the errors the SDK would retry.
+
+    That is connection errors (including timeouts), 408/409/429 and any 5xx.
+    The SDK's own retries are turned off for this call only, so its shorter
+    waits don't run ahead of the rate-limit headers honored here.
+    """
+    messages = client.with_options(max_retries=0).messages
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return await messages.create(**kwargs)
+        except anthropic.APIConnectionError as e:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = RETRY_BASE_SECONDS * 2 ** attempt + random.uniform(0, 1)
+            print("  [%s] %s, retrying in %.1fs..." % (episode_id, type(e).__name__, delay))
+            await asyncio.sleep(delay)
+        except anthropic.APIStatusError as e:
+            retryable = e.status_code in RETRYABLE_STATUS or e.status_code >= 500
+            if not retryable or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = max(retry_after_seconds(e), RETRY_BASE_SECONDS * 2 ** attempt) + random.uniform(0, 1)
+            print("  [%s] HTTP %d, retrying in %.1fs..." % (episode_id, e.status_code, delay))
+            await asyncio.sleep(delay)
+
+
+async def truncate_to_token_budget(client, model, text):
+    # type: (anthropic.AsyncAnthropic, str, str) -> str
+    """Cut text down to about MAX_INPUT_TOKENS tokens.
+
+    Texts that are clearly under budget by the local CHARS_PER_TOKEN estimate
+    are returned as-is; only longer ones pay for an exact count_tokens call,
+    which then sets the cut point.
+    """
+    if len(text) / CHARS_PER_TOKEN <= MAX_INPUT_TOKENS:
+        return text
+
+    try:
+        counted = await client.messages.count_tokens(
+            model=model,
+            messages=[{"role": "user", "content": text}],
+        )
+        tokens = counted.input_tokens
+    except anthropic.APIError:
+        tokens = len(text) / CHARS_PER_TOKEN  # Fall back to the estimate
+
+    if tokens <= MAX_INPUT_TOKENS:
+        return text
+    cut = int(len(text) * MAX_INPUT_TOKENS / tokens)
+    return text[:cut].rsplit(" ", 1)[0] + " [TRUNCATED]"
+
+
+def request_params(model, max_tokens, content):
+    # type: (str, int, str) -> dict
+    """messages.create arguments for analyzing one episode's content."""
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        # The system prompt and extraction instructions are identical for
+        # every episode, so mark them as a cacheable prefix; only the
+        # trailing episode content is billed at the full input rate.
+        # Together they are only ~750 tokens, under the 1024-token minimum
+        # cacheable prefix (higher still for Haiku), so for now the API
+        # ignores the markers; they take effect once the prompts grow past it.
+        "system": [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+        ],
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": EXTRACTION_PROMPT, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": content},
+                ],
+            }
+        ],
+    }
+
+
+async def prepare_episode(client, episode, force=False):
+    # type: (anthropic.AsyncAnthropic, dict, bool) -> Tuple[Optional[str], Optional[dict], Optional[dict]]
+    """Work out what analyzing an episode takes.
+
+    Returns (cache_path, cached_analysis, params). On a cache hit
+    cached_analysis is set; otherwise params holds the messages.create
+    arguments. All three are None for an episode with no content. With
+    force the cache is not read, so every episode gets params.
+    """
     transcript = episode.get("transcript")
     description = episode.get("description") or ""
 
     if not transcript and not description:
-        return None
+        return None, None, None
 
     # Build the content to analyze
     context = "Episode Title: %s\n" % episode.get("title", "Unknown")
 
     if transcript:
         # Format with timestamp markers
-        timestamped = format_timestamped_transcript(episode)
-        # Truncate very long transcripts to stay within context limits
-        words = timestamped.split()
-        if len(words) > 14000:
-            timestamped = " ".join(words[:14000]) + " [TRUNCATED]"
         context += "Episode Description: %s\n\n" % description[:500]
-        content = context + "FULL TRANSCRIPT (with approximate [MM:SS] timestamp markers):\n" + timestamped
+        header = context + "FULL TRANSCRIPT (with approximate [MM:SS] timestamp markers):\n"
+        body = format_timestamped_transcript(episode)
+        model, max_tokens = MODEL, MAX_TOKENS
     else:
         # Use the full description as the content source
-        content = context + "EPISODE DESCRIPTION (no transcript available):\n" + description
+        header = context + "EPISODE DESCRIPTION (no transcript available):\n"
+        body = description
+        model, max_tokens = FAST_MODEL, FAST_MAX_TOKENS
 
-    try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=4000,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": EXTRACTION_PROMPT + content,
-                }
-            ],
-        )
-
-        # Extract the text content
-        text = response.content[0].text.strip()
+    # Identical content was already analyzed by an earlier run
+    cached_path = cache_path(model, header + body)
+    if not force and os.path.exists(cached_path):
+        return cached_path, load_json(cached_path), None
 
-        # Remove markdown fencing if present
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1]  # Remove first line
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
+    if transcript:
+        # Keep very long transcripts within the per-episode cost ceiling
+        body = await truncate_to_token_budget(client, model, body)
+    return cached_path, None, request_params(model, max_tokens, header + body)
 
-        analysis = json.loads(text)
-        return analysis
 
+def parse_analysis(episode_id, text, cached_path):
+    # type: (str, str, str) -> Optional[dict]
+    """Parse Claude's reply into an analysis dict and cache it; None if it isn't valid JSON."""
+    try:
+        analysis = parse_json_response(text)
     except json.JSONDecodeError as e:
-        print("  JSON parse error: %s" % e)
-        print("  Raw response: %s..." % text[:200])
+        print("  [%s] JSON parse error: %s" % (episode_id, e))
+        print("  [%s] Raw response: %s..." % (episode_id, text[:200]))
         return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    save_json(cached_path, analysis, pretty=False)
+    return analysis
+
+
+async def analyze_episode(client, episode, limiter, force=False):
+    # type: (anthropic.AsyncAnthropic, dict, TokenRateLimiter, bool) -> Optional[dict]
+    """Send a transcript (or description) to Claude and get structured analysis back."""
+    try:
+        cached_path, analysis, params = await prepare_episode(client, episode, force)
+        if params is None:
+            return analysis
+
+        # A local estimate is enough to pace requests
+        content = params["messages"][0]["content"][-1]["text"]
+        await limiter.acquire(int(len(SYSTEM_PROMPT + EXTRACTION_PROMPT + content) / CHARS_PER_TOKEN))
+
+        response = await create_with_retry(client, episode["id"], **params)
+        return parse_analysis(episode["id"], response.content[0].text, cached_path)
+
     except anthropic.APIError as e:
-        print("  API error: %s" % e)
+        print("  [%s] API error: %s" % (episode["id"], e))
         return None
     except Exception as e:
-        print("  Unexpected error: %s" % e)
+        print("  [%s] Unexpected error: %s" % (episode["id"], e))
         return None
 
 
-def build_use_cases_index(episodes: list) -> list:
-    """Flatten all use cases across episodes into a single searchable list."""
-    use_cases = []
+def record_result(episode, analysis, progress, use_cases):
+    # type: (dict, Optional[dict], BinaryIO, list) -> bool
+    """Store an episode's analysis (None on failure); returns whether it succeeded.
+
+    Successes are added to the use_cases index and logged to the progress
+    file (allows resuming).
+    """
+    episode["analysis"] = analysis
+    if not analysis:
+        return False
+    print("  Extracted %d use cases" % len(analysis.get("use_cases", [])))
+    use_cases.extend(build_use_cases_index([episode]))
+    progress.write(dump_json({"id": episode["id"], "analysis": analysis}) + b"\n")
+    progress.flush()
+    return True
+
+
+async def analyze_all(client, to_analyze, use_cases, force=False):
+    # type: (anthropic.AsyncAnthropic, list, list, bool) -> Tuple[int, int]
+    """Analyze episodes concurrently, logging each result to PROGRESS_PATH as it arrives.
+
+    Index rows for each successful episode are appended to use_cases.
+    Returns (success_count, fail_count).
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    limiter = TokenRateLimiter(INPUT_TOKENS_PER_MINUTE)
+
+    async def run(episode):
+        async with sem:
+            return episode, await analyze_episode(client, episode, limiter, force)
+
+    success_count = 0
+    fail_count = 0
+
+    with open(PROGRESS_PATH, "ab") as progress:
+        for i, next_done in enumerate(asyncio.as_completed([run(ep) for ep in to_analyze])):
+            episode, analysis = await next_done
+            print("[%d/%d] Analyzed: %s..." % (i + 1, len(to_analyze), episode["title"][:60]))
+            if record_result(episode, analysis, progress, use_cases):
+                success_count += 1
+            else:
+                fail_count += 1
+
+    return success_count, fail_count
 
-    for ep in episodes:
-        analysis = ep.get("analysis")
-        if not analysis or not analysis.get("use_cases"):
+
+async def collect_batch(client, batch_id, pending, progress, use_cases):
+    # type: (anthropic.AsyncAnthropic, str, dict, BinaryIO, list) -> Tuple[int, int]
+    """Poll a Message Batches job until it ends, then record each result.
+
+    pending maps custom_id (episode id) to (episode, cache path); results
+    for anything else are ignored. Returns (success_count, fail_count).
+    """
+    success_count = 0
+    fail_count = 0
+
+    batch = await client.messages.batches.retrieve(batch_id)
+    while batch.processing_status != "ended":
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch = await client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        print("  %d processing, %d succeeded, %d errored" % (counts.processing, counts.succeeded, counts.errored))
+
+    async for result in await client.messages.batches.results(batch_id):
+        if result.custom_id not in pending:
             continue
+        episode, cached_path = pending[result.custom_id]
+        print("Result: %s..." % episode["title"][:60])
+        if result.result.type == "succeeded":
+            analysis = parse_analysis(episode["id"], result.result.message.content[0].text, cached_path)
+        else:
+            print("  [%s] Batch request %s" % (episode["id"], result.result.type))
+            analysis = None
+        if record_result(episode, analysis, progress, use_cases):
+            success_count += 1
+        else:
+            fail_count += 1
+
+    return success_count, fail_count
 
-        for uc in analysis["use_cases"]:
-            use_cases.append(
-                {
-                    "title": uc.get("title"),
-                    "one_liner": uc.get("one_liner"),
-                    "description": uc.get("description"),
-                    "tools": uc.get("tools", []),
-                    "category": uc.get("category"),
-                    "audience": uc.get("audience"),
-                    "difficulty": uc.get("difficulty"),
-                    "timestamp_seconds": uc.get("timestamp_seconds"),
-                    "episode_id": ep["id"],
-                    "episode_title": ep["title"],
-                    "episode_url": ep.get("url"),
-                    "guest_name": analysis.get("guest_name"),
-                    "guest_role": analysis.get("guest_role"),
-                    "publish_date": ep.get("publish_date"),
-                }
-            )
-
-    return use_cases
+
+async def analyze_batch(client, to_analyze, use_cases, force=False):
+    # type: (anthropic.AsyncAnthropic, list, list, bool) -> Tuple[int, int]
+    """Analyze episodes as one Message Batches job (half the cost, results within 24h).
+
+    A batch left behind by an interrupted run (see BATCH_STATE_PATH) is
+    collected first. Of the remaining episodes, cache hits are recorded
+    immediately; everything else is submitted in a single batch, polled
+    until it ends, and merged back by custom_id.
+    Returns (success_count, fail_count).
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def prepare(episode):
+        async with sem:
+            return episode, await prepare_episode(client, episode, force)
+
+    success_count = 0
+    fail_count = 0
+    requests = []
+    pending = {}  # custom_id (episode id) -> (episode, cache path)
+
+    with open(PROGRESS_PATH, "ab") as progress:
+        if os.path.exists(BATCH_STATE_PATH):
+            state = load_json(BATCH_STATE_PATH)
+            by_id = {ep["id"]: ep for ep in to_analyze}
+            resumed = {
+                ep_id: (by_id[ep_id], os.path.join(CACHE_DIR, cache_file))
+                for ep_id, cache_file in state["cache_files"].items()
+                if ep_id in by_id
+            }
+            print("Resuming batch %s from an interrupted run (%d requests still needed)." % (
+                state["batch_id"], len(resumed)
+            ))
+            try:
+                success_count, fail_count = await collect_batch(
+                    client, state["batch_id"], resumed, progress, use_cases
+                )
+            except anthropic.NotFoundError:
+                print("  Batch %s no longer exists; its episodes will be resubmitted." % state["batch_id"])
+            else:
+                to_analyze = [ep for ep in to_analyze if ep["id"] not in resumed]
+            os.remove(BATCH_STATE_PATH)
+
+        for episode, (cached_path, analysis, params) in await asyncio.gather(*[prepare(ep) for ep in to_analyze]):
+            if params is None:
+                print("Cached: %s..." % episode["title"][:60])
+                if record_result(episode, analysis, progress, use_cases):
+                    success_count += 1
+                else:
+                    fail_count += 1
+                continue
+            requests.append({"custom_id": episode["id"], "params": params})
+            pending[episode["id"]] = (episode, cached_path)
+
+        if not requests:
+            return success_count, fail_count
+
+        batch = await client.messages.batches.create(requests=requests)
+        # Saved before polling, which can take up to 24h
+        save_json(BATCH_STATE_PATH, {
+            "batch_id": batch.id,
+            "cache_files": {ep_id: os.path.basename(path) for ep_id, (_, path) in pending.items()},
+        })
+        print("Submitted batch %s with %d requests (%d cached)." % (batch.id, len(requests), success_count))
+        successes, failures = await collect_batch(client, batch.id, pending, progress, use_cases)
+        success_count += successes
+        fail_count += failures
+        # Every result is now in the progress log
+        os.remove(BATCH_STATE_PATH)
+
+    return success_count, fail_count
+
+
+def build_use_cases_index(episodes: list) -> list:
+    """Flatten all use cases across episodes into a single searchable list."""
+    # Episode-level fields are bound once per episode rather than per use case
+    return [
+        {
+            "title": uc.get("title"),
+            "one_liner": uc.get("one_liner"),
+            "description": uc.get("description"),
+            "tools": uc.get("tools", []),
+            "category": uc.get("category"),
+            "audience": uc.get("audience"),
+            "difficulty": uc.get("difficulty"),
+            "timestamp_seconds": uc.get("timestamp_seconds"),
+            "episode_id": episode_id,
+            "episode_title": episode_title,
+            "episode_url": episode_url,
+            "guest_name": guest_name,
+            "guest_role": guest_role,
+            "publish_date": publish_date,
+        }
+        for ep in episodes
+        if (analysis := ep.get("analysis")) and analysis.get("use_cases")
+        for episode_id, episode_title, episode_url, guest_name, guest_role, publish_date in [(
+            ep["id"],
+            ep["title"],
+            ep.get("url"),
+            analysis.get("guest_name"),
+            analysis.get("guest_role"),
+            ep.get("publish_date"),
+        )]
+        for uc in analysis["use_cases"]
+    ]
 
 
 def main():
@@ -221,72 +634,89 @@ def main():
         sys.exit(1)
 
     force = "--force" in sys.argv
-    client = anthropic.Anthropic(api_key=api_key)
+    use_batch = "--batch" in sys.argv
+    # messages.create goes through create_with_retry, which honors rate-limit
+    # headers; other calls (count_tokens, batches) keep the SDK's retries
+    client = anthropic.AsyncAnthropic(api_key=api_key)
 
     # Load episodes
     if not os.path.exists(INPUT_PATH):
         print("ERROR: %s not found. Run collect.py first." % INPUT_PATH)
         sys.exit(1)
 
-    with open(INPUT_PATH, "r", encoding="utf-8") as f:
-        episodes = json.load(f)
+    episodes = load_json(INPUT_PATH)
 
     print("Loaded %d episodes." % len(episodes))
 
     # Check for existing analyzed data to allow resuming (skip with --force)
     analyzed_ids = set()
-    if not force and os.path.exists(OUTPUT_PATH):
-        with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-            existing = json.load(f)
-            for ep in existing:
-                if ep.get("analysis"):
-                    analyzed_ids.add(ep["id"])
-                    # Merge existing analysis into current episodes
-                    for e in episodes:
-                        if e["id"] == ep["id"]:
-                            e["analysis"] = ep["analysis"]
-                            break
-        print("Found %d already-analyzed episodes (will skip)." % len(analyzed_ids))
-    elif force:
-        print("--force flag set: re-analyzing ALL episodes.")
+    use_cases = []  # Index rows, extended as each episode's analysis completes
+    if not force:
+        # Episode id -> analysis from earlier runs; results logged by a run
+        # that died before its final save are newer, so they win
+        prior = {}
+        if os.path.exists(OUTPUT_PATH):
+            prior.update((ep["id"], ep.get("analysis")) for ep in load_json(OUTPUT_PATH))
+        logged = load_progress()
+        prior.update(logged)
+
+        # Merge existing analysis into current episodes
+        by_id = {e["id"]: e for e in episodes}
+        for ep_id, analysis in prior.items():
+            episode = by_id.get(ep_id)
+            if analysis and episode is not None:
+                episode["analysis"] = analysis
+                analyzed_ids.add(ep_id)
+        if analyzed_ids:
+            print("Found %d already-analyzed episodes (will skip)." % len(analyzed_ids))
+
+        # Reuse index rows of skipped episodes (keeping any fields enrich.py
+        # added); only episodes with no rows on disk are projected here
+        if os.path.exists(USE_CASES_PATH):
+            use_cases = [
+                uc for uc in load_json(USE_CASES_PATH)
+                if uc["episode_id"] in analyzed_ids and uc["episode_id"] not in logged
+            ]
+        indexed_ids = {uc["episode_id"] for uc in use_cases}
+        use_cases.extend(build_use_cases_index([by_id[i] for i in analyzed_ids - indexed_ids]))
+    else:
+        print("--force flag set: re-analyzing ALL episodes, ignoring cached analyses.")
+        if os.path.exists(PROGRESS_PATH):
+            os.remove(PROGRESS_PATH)
 
     # Analyze all episodes — those with transcripts get full analysis,
     # those with only descriptions get lighter analysis
-    episodes_with_content = [e for e in episodes if e.get("transcript") or e.get("description")]
-    to_analyze = [e for e in episodes_with_content if e["id"] not in analyzed_ids]
-    with_transcript = sum(1 for e in to_analyze if e.get("transcript"))
+    content_count = 0
+    to_analyze = []
+    with_transcript = 0
+    for e in episodes:
+        transcript = e.get("transcript")
+        if transcript or e.get("description"):
+            content_count += 1
+            if e["id"] not in analyzed_ids:
+                to_analyze.append(e)
+                with_transcript += bool(transcript)
     desc_only = len(to_analyze) - with_transcript
     print("%d episodes have content, %d need analysis (%d with transcript, %d description-only)." % (
-        len(episodes_with_content), len(to_analyze), with_transcript, desc_only
+        content_count, len(to_analyze), with_transcript, desc_only
     ))
 
-    success_count = 0
-    fail_count = 0
-
-    for i, episode in enumerate(to_analyze):
-        print("[%d/%d] Analyzing: %s..." % (i + 1, len(to_analyze), episode['title'][:60]))
-        analysis = analyze_episode(client, episode)
-
-        if analysis:
-            episode["analysis"] = analysis
-            success_count += 1
-            uc_count = len(analysis.get("use_cases", []))
-            print("  Extracted %d use cases" % uc_count)
-        else:
-            episode["analysis"] = None
-            fail_count += 1
-
-        # Save after each episode (allows resuming)
-        with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-            json.dump(episodes, f, indent=2, ensure_ascii=False)
-
-        if i < len(to_analyze) - 1:
-            time.sleep(DELAY_SECONDS)
-
-    # Build and save use cases index
-    use_cases = build_use_cases_index(episodes)
-    with open(USE_CASES_PATH, "w", encoding="utf-8") as f:
-        json.dump(use_cases, f, indent=2, ensure_ascii=False)
+    if use_batch:
+        print("Analyzing via the Message Batches API...")
+        success_count, fail_count = asyncio.run(analyze_batch(client, to_analyze, use_cases, force))
+    else:
+        print("Analyzing with up to %d concurrent requests..." % MAX_CONCURRENT)
+        success_count, fail_count = asyncio.run(analyze_all(client, to_analyze, use_cases, force))
+
+    save_json(OUTPUT_PATH, episodes)
+    # Everything in the progress log is now in OUTPUT_PATH
+    if os.path.exists(PROGRESS_PATH):
+        os.remove(PROGRESS_PATH)
+
+    # Save use cases index, in episode order
+    order = {e["id"]: i for i, e in enumerate(episodes)}
+    use_cases.sort(key=lambda uc: order[uc["episode_id"]])
+    save_json(USE_CASES_PATH, use_cases)
 
     print("\nDone! %d analyzed, %d failed." % (success_count, fail_count))
     print("Total use cases extracted: %d" % len(use_cases))
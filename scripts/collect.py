@@ -13,24 +13,99 @@ Output:
 import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Tuple, List, Dict
 
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
 CHANNEL_URL = "https://www.youtube.com/@howiaipodcast/videos"
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes.json")
-DELAY_SECONDS = 5  # Longer delay to avoid YouTube rate limiting
+# Append-only log of transcripts fetched this run (one JSON object per line), so
+# progress is saved without rewriting OUTPUT_PATH; folded into it at the end
+PROGRESS_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes.jsonl")
+MAX_WORKERS = 6  # Concurrent transcript fetches
+REQUEST_INTERVAL_SECONDS = 1  # Min spacing between request starts, across all workers
+
+
+def dump_json(data, pretty=False):
+    # type: (object, bool) -> bytes
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(path):
+    # type: (str) -> object
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def save_json(path, data, pretty=True):
+    # type: (str, object, bool) -> None
+    """Write JSON atomically: dump to a temp file, then swap it into place."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_json(data, pretty))
+    os.replace(tmp_path, path)
+
+
+def load_progress():
+    # type: () -> Dict[str, Dict]
+    """Read transcripts logged to PROGRESS_PATH by an interrupted run, keyed by video id."""
+    progress = {}
+    if not os.path.exists(PROGRESS_PATH):
+        return progress
+    with open(PROGRESS_PATH, "rb") as f:
+        for line in f:
+            try:
+                record = orjson.loads(line) if orjson else json.loads(line)
+            except ValueError:
+                continue  # Partial last line from a crash
+            progress[record["id"]] = record
+    return progress
+
+
+class RateLimiter:
+    """Thread-safe token bucket (capacity 1) spacing calls `interval` seconds apart."""
+
+    def __init__(self, interval):
+        # type: (float) -> None
+        self.interval = interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        # type: () -> None
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(slot - now)
 
 
 def fetch_video_list():
-    """Use yt-dlp to get metadata for every video on the channel."""
+    """Use yt-dlp to list every video on the channel.
+
+    The listing is flat (no per-video page fetch), so descriptions and upload
+    dates may be missing or abbreviated; hydrate_videos() fills them in.
+    """
     print("Fetching video list from %s ..." % CHANNEL_URL)
     ydl_opts = {
         "quiet": True,
         "no_warnings": True,
-        "extract_flat": False,
+        "extract_flat": "in_playlist",
         "skip_download": True,
         "ignoreerrors": True,
     }
@@ -53,14 +128,15 @@ def fetch_video_list():
         if duration < 60:
             continue
 
+        thumbnails = entry.get("thumbnails") or []
         videos.append(
             {
                 "id": entry.get("id"),
                 "title": entry.get("title"),
-                "description": entry.get("description", ""),
+                "description": "",  # Set by hydrate_videos()
                 "publish_date": entry.get("upload_date"),  # YYYYMMDD
                 "duration_seconds": duration,
-                "thumbnail_url": entry.get("thumbnail"),
+                "thumbnail_url": entry.get("thumbnail") or (thumbnails[-1].get("url") if thumbnails else None),
                 "url": "https://www.youtube.com/watch?v=%s" % entry.get("id"),
                 "transcript": None,
                 "transcript_segments": None,
@@ -71,39 +147,73 @@ def fetch_video_list():
     return videos
 
 
+def hydrate_videos(videos, existing_data):
+    # type: (List[Dict], Dict[str, Dict]) -> None
+    """Fill in the metadata the flat channel listing leaves out.
+
+    Videos already in the cache reuse their stored description and date; only
+    new videos, and ones flagged needs_hydration by an earlier failed fetch,
+    cost a per-video request.
+    """
+    to_fetch = []
+    for video in videos:
+        cached = existing_data.get(video["id"])
+        if cached and cached.get("description") is not None and not cached.get("needs_hydration"):
+            video["description"] = cached["description"]
+            video["publish_date"] = video["publish_date"] or cached.get("publish_date")
+            video["thumbnail_url"] = cached.get("thumbnail_url") or video["thumbnail_url"]
+        else:
+            to_fetch.append(video)
+
+    if not to_fetch:
+        return
+
+    print("Fetching full metadata for %d new videos..." % len(to_fetch))
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "ignoreerrors": True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        for video in to_fetch:
+            info = ydl.extract_info(video["url"], download=False)
+            if not info:
+                print("  Warning: Could not fetch metadata for %s" % video["id"])
+                video["needs_hydration"] = True  # Retried on the next run
+                continue
+            video["description"] = info.get("description") or ""
+            video["publish_date"] = info.get("upload_date") or video["publish_date"]
+            video["thumbnail_url"] = info.get("thumbnail") or video["thumbnail_url"]
+
+
+def transcript_from_snippets(fetched):
+    # type: (...) -> Tuple[str, List[Dict]]
+    """Build (plain_text, segments) from fetched transcript snippets in a single pass."""
+    texts = []
+    segments = []
+    for snippet in fetched:
+        texts.append(snippet.text)
+        segments.append({
+            "text": snippet.text,
+            "start": round(snippet.start, 1),
+        })
+    return " ".join(texts), segments
+
+
 def fetch_transcript(ytt_api, video_id):
     # type: (YouTubeTranscriptApi, str) -> Tuple[Optional[str], Optional[List[Dict]]]
     """Fetch English transcript for a single video.
     Returns (plain_text, segments) where segments is a list of {text, start} dicts."""
     try:
-        fetched = ytt_api.fetch(video_id, languages=["en"])
-        segments = []
-        texts = []
-        for snippet in fetched:
-            texts.append(snippet.text)
-            segments.append({
-                "text": snippet.text,
-                "start": round(snippet.start, 1),
-            })
-        full_text = " ".join(texts)
-        return full_text, segments
+        return transcript_from_snippets(ytt_api.fetch(video_id, languages=["en"]))
     except Exception as e:
         # Try listing available transcripts and fetching whatever is available
         try:
             transcript_list = ytt_api.list(video_id)
             for transcript in transcript_list:
                 try:
-                    fetched = transcript.fetch()
-                    segments = []
-                    texts = []
-                    for snippet in fetched:
-                        texts.append(snippet.text)
-                        segments.append({
-                            "text": snippet.text,
-                            "start": round(snippet.start, 1),
-                        })
-                    full_text = " ".join(texts)
-                    return full_text, segments
+                    return transcript_from_snippets(transcript.fetch())
                 except Exception:
                     continue
         except Exception:
@@ -119,66 +229,79 @@ def main():
 
     # Load existing data to preserve already-fetched transcripts
     existing_data = {}
-    if not force and os.path.exists(OUTPUT_PATH):
-        with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-            existing = json.load(f)
+    if not force:
+        if os.path.exists(OUTPUT_PATH):
+            existing = load_json(OUTPUT_PATH)
             for ep in existing:
                 existing_data[ep["id"]] = ep
-        print("Loaded %d existing episodes from cache." % len(existing_data))
+        # Replay transcripts logged by a run that died before its final save
+        for vid, record in load_progress().items():
+            existing_data[vid] = dict(existing_data.get(vid, {}), **record)
+        if existing_data:
+            print("Loaded %d existing episodes from cache." % len(existing_data))
+    elif os.path.exists(PROGRESS_PATH):
+        os.remove(PROGRESS_PATH)
+
+    hydrate_videos(videos, existing_data)
 
     ytt_api = YouTubeTranscriptApi()
+    limiter = RateLimiter(REQUEST_INTERVAL_SECONDS)
+    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 
     success_count = 0
     skip_count = 0
     fail_count = 0
 
-    for i, video in enumerate(videos):
-        vid = video["id"]
-        title_short = video["title"][:60] if video.get("title") else "Unknown"
-
-        # Check if we already have a transcript with segments
-        existing = existing_data.get(vid)
+    # Reuse cached transcripts that already have timestamp segments; anything
+    # else (new, or plain text without segments) is fetched
+    to_fetch = []
+    for video in videos:
+        existing = existing_data.get(video["id"])
         if existing and existing.get("transcript") and existing.get("transcript_segments"):
             video["transcript"] = existing["transcript"]
             video["transcript_segments"] = existing["transcript_segments"]
             skip_count += 1
-            print("[%d/%d] Skipping (cached): %s" % (i + 1, len(videos), title_short))
-            continue
-        elif existing and existing.get("transcript") and not existing.get("transcript_segments"):
-            # Has plain text but no segments — need to re-fetch for segments
-            print("[%d/%d] Re-fetching for timestamps: %s..." % (i + 1, len(videos), title_short))
         else:
-            print("[%d/%d] Fetching transcript for: %s..." % (i + 1, len(videos), title_short))
+            to_fetch.append(video)
 
-        transcript, segments = fetch_transcript(ytt_api, vid)
-        video["transcript"] = transcript
-        video["transcript_segments"] = segments
+    print("%d transcripts cached, fetching %d with %d workers..." % (skip_count, len(to_fetch), MAX_WORKERS))
 
-        if transcript:
-            success_count += 1
-            word_count = len(transcript.split())
-            seg_count = len(segments) if segments else 0
-            print("  Got %d words, %d segments" % (word_count, seg_count))
-        else:
-            # Preserve existing plain-text transcript if re-fetch fails
-            if existing and existing.get("transcript"):
-                video["transcript"] = existing["transcript"]
-                print("  Re-fetch failed, keeping existing plain text")
-            fail_count += 1
-
-        # Save after each fetch (allows resuming)
-        os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-        with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-            json.dump(videos, f, indent=2, ensure_ascii=False)
-
-        # Rate-limit
-        if i < len(videos) - 1:
-            time.sleep(DELAY_SECONDS)
-
-    # Final save
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(videos, f, indent=2, ensure_ascii=False)
+    def fetch(video):
+        limiter.wait()
+        return fetch_transcript(ytt_api, video["id"])
+
+    # Workers only fetch; results are applied and logged from this thread
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, open(PROGRESS_PATH, "ab") as progress:
+        futures = {executor.submit(fetch, video): video for video in to_fetch}
+        for i, future in enumerate(as_completed(futures)):
+            video = futures[future]
+            title_short = video["title"][:60] if video.get("title") else "Unknown"
+            print("[%d/%d] %s..." % (i + 1, len(to_fetch), title_short))
+
+            transcript, segments = future.result()
+            video["transcript"] = transcript
+            video["transcript_segments"] = segments
+
+            if transcript:
+                success_count += 1
+                word_count = len(transcript.split())
+                seg_count = len(segments) if segments else 0
+                print("  Got %d words, %d segments" % (word_count, seg_count))
+                # Log just this transcript (allows resuming)
+                record = {"id": video["id"], "transcript": transcript, "transcript_segments": segments}
+                progress.write(dump_json(record) + b"\n")
+                progress.flush()
+            else:
+                # Preserve existing plain-text transcript if re-fetch fails
+                existing = existing_data.get(video["id"])
+                if existing and existing.get("transcript"):
+                    video["transcript"] = existing["transcript"]
+                    print("  Re-fetch failed, keeping existing plain text")
+                fail_count += 1
+
+    # Final save; everything in the progress log is now in OUTPUT_PATH
+    save_json(OUTPUT_PATH, videos)
+    os.remove(PROGRESS_PATH)
 
     print("\nDone! %d fetched, %d skipped (cached), %d failed." % (success_count, skip_count, fail_count))
     with_transcript = sum(1 for v in videos if v.get("transcript"))
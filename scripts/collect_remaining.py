@@ -14,86 +14,114 @@ import json
 import os
 import re
 import sys
+import threading
 import time
 import glob
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 import yt_dlp
 
 EPISODES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "episodes.json")
-DELAY_SECONDS = 3
+MAX_WORKERS = 4  # Concurrent subtitle downloads
+REQUEST_INTERVAL_SECONDS = 1  # Min spacing between request starts, across all workers
+
+# VTT headers, sequence numbers, and timestamp/cue-timing lines, in one pattern
+_SKIP_LINE = re.compile(r"WEBVTT|Kind:|Language:|\d+$|\d{2}:\d{2}|.*-->")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+class RateLimiter:
+    """Thread-safe token bucket (capacity 1) spacing calls `interval` seconds apart."""
+
+    def __init__(self, interval):
+        # type: (float) -> None
+        self.interval = interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        # type: () -> None
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(slot - now)
 
 
 def clean_subtitle_text(vtt_content):
     """Extract plain text from VTT/SRT subtitle content."""
     lines = vtt_content.split("\n")
-    text_lines = []
-    seen = set()
+    # Dicts keep insertion order, so one doubles as an ordered "seen" set
+    text_lines = {}
+    skip_line = _SKIP_LINE.match
+    strip_tags = _HTML_TAG.sub
 
     for line in lines:
         line = line.strip()
         # Skip empty lines, timestamps, VTT headers, and sequence numbers
-        if not line:
-            continue
-        if line.startswith("WEBVTT"):
-            continue
-        if line.startswith("Kind:") or line.startswith("Language:"):
-            continue
-        if re.match(r"^\d+$", line):
-            continue
-        if re.match(r"^\d{2}:\d{2}", line):
-            continue
-        if "-->" in line:
+        if not line or skip_line(line):
             continue
 
         # Remove HTML tags
-        clean = re.sub(r"<[^>]+>", "", line)
-        clean = clean.strip()
+        clean = strip_tags("", line).strip()
 
-        if clean and clean not in seen:
-            seen.add(clean)
-            text_lines.append(clean)
+        if clean:
+            text_lines[clean] = None
 
     return " ".join(text_lines)
 
 
-def download_subtitles_for_video(video_id):
-    """Use yt-dlp to download auto-generated subtitles for a video."""
+def download_subtitles_for_video(ydl, video_id, tmpdir):
+    # type: (yt_dlp.YoutubeDL, str, str) -> Optional[str]
+    """Use yt-dlp to download auto-generated subtitles for a video.
+
+    `ydl` must write into `tmpdir` (see make_ydl); the subtitle file is
+    removed once it has been read.
+    """
     url = "https://www.youtube.com/watch?v=%s" % video_id
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        output_template = os.path.join(tmpdir, "%(id)s")
-
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "skip_download": True,
-            "writeautomaticsub": True,
-            "writesubtitles": True,
-            "subtitleslangs": ["en"],
-            "subtitlesformat": "vtt",
-            "outtmpl": output_template,
-        }
-
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-        except Exception as e:
-            print("  yt-dlp error: %s" % e)
-            return None
-
-        # Look for the subtitle file
-        vtt_files = glob.glob(os.path.join(tmpdir, "*.vtt"))
-        if not vtt_files:
-            print("  No subtitle file generated")
-            return None
-
-        # Read and parse the VTT file
-        with open(vtt_files[0], "r", encoding="utf-8") as f:
-            content = f.read()
-
-        text = clean_subtitle_text(content)
-        return text if text else None
+    try:
+        ydl.download([url])
+    except Exception as e:
+        print("  [%s] yt-dlp error: %s" % (video_id, e))
+        return None
+
+    # yt-dlp names the file <id>.<lang>.vtt; only scan the directory (shared
+    # by all videos) when the language tag isn't plain "en", e.g. "en-US"
+    expected = os.path.join(tmpdir, "%s.en.vtt" % video_id)
+    if os.path.exists(expected):
+        vtt_files = [expected]
+    else:
+        vtt_files = glob.glob(os.path.join(tmpdir, "%s.*vtt" % video_id))
+    if not vtt_files:
+        print("  [%s] No subtitle file generated" % video_id)
+        return None
+
+    # Read and parse the VTT file
+    with open(vtt_files[0], "r", encoding="utf-8") as f:
+        content = f.read()
+    for path in vtt_files:
+        os.remove(path)
+
+    text = clean_subtitle_text(content)
+    return text if text else None
+
+
+def make_ydl(tmpdir):
+    # type: (str) -> yt_dlp.YoutubeDL
+    """Create a YoutubeDL that writes English VTT subtitles into tmpdir as <id>.<lang>.vtt."""
+    return yt_dlp.YoutubeDL({
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "writeautomaticsub": True,
+        "writesubtitles": True,
+        "subtitleslangs": ["en"],
+        "subtitlesformat": "vtt",
+        "outtmpl": os.path.join(tmpdir, "%(id)s"),
+    })
 
 
 def main():
@@ -114,26 +142,45 @@ def main():
 
     success = 0
     fail = 0
+    limiter = RateLimiter(REQUEST_INTERVAL_SECONDS)
+    # One YoutubeDL per worker thread, reused across videos so its HTTP
+    # session and extractor setup aren't rebuilt for every download.
+    # Instances aren't shared between threads because they carry
+    # per-download state.
+    local = threading.local()
+    ydls = []
+
+    def download(ep):
+        ydl = getattr(local, "ydl", None)
+        if ydl is None:
+            ydl = local.ydl = make_ydl(tmpdir)
+            ydls.append(ydl)
+        limiter.wait()
+        return download_subtitles_for_video(ydl, ep["id"], tmpdir)
 
-    for i, ep in enumerate(missing):
-        vid = ep["id"]
-        title_short = (ep.get("title") or "Unknown")[:60]
-        print("[%d/%d] Downloading subtitles for: %s..." % (i + 1, len(missing), title_short))
-
-        text = download_subtitles_for_video(vid)
-        if text:
-            ep["transcript"] = text
-            success += 1
-            print("  Got %d words" % len(text.split()))
-        else:
-            fail += 1
-
-        # Save progress after each video
-        with open(EPISODES_PATH, "w", encoding="utf-8") as f:
-            json.dump(episodes, f, indent=2, ensure_ascii=False)
-
-        if i < len(missing) - 1:
-            time.sleep(DELAY_SECONDS)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Workers only download; results are applied and saved from this thread
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(download, ep): ep for ep in missing}
+            for i, future in enumerate(as_completed(futures)):
+                ep = futures[future]
+                title_short = (ep.get("title") or "Unknown")[:60]
+                print("[%d/%d] Downloaded subtitles for: %s..." % (i + 1, len(missing), title_short))
+
+                text = future.result()
+                if text:
+                    ep["transcript"] = text
+                    success += 1
+                    print("  Got %d words" % len(text.split()))
+                else:
+                    fail += 1
+
+                # Save progress after each video
+                with open(EPISODES_PATH, "w", encoding="utf-8") as f:
+                    json.dump(episodes, f, indent=2, ensure_ascii=False)
+
+        for ydl in ydls:
+            ydl.close()
 
     print("\nDone! %d additional transcripts fetched, %d still missing." % (success, fail))
     total_with = sum(1 for ep in episodes if ep.get("transcript"))
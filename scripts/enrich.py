@@ -9,20 +9,51 @@ Usage:
     ANTHROPIC_API_KEY=sk-... python scripts/enrich.py
 
     Pass --force to re-enrich use cases that already have intents assigned.
+    An interrupted run resumes from its checkpoint; a --force run only resumes
+    results logged by an earlier --force run. Delete
+    data/use-cases.enrich.ckpt.jsonl to start over.
+    Pass --batch to submit all batches as one Message Batches job (half the
+    cost; results can take a while). An interrupted --batch run's job is
+    collected by the next --batch run rather than submitted again.
 """
 
+import asyncio
+import collections
 import json
 import os
+import random
 import sys
-import time
-from typing import List, Dict, Any
+from typing import BinaryIO, List, Dict, Any, Optional, Set, Tuple
 
 import anthropic
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
 USE_CASES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "use-cases.json")
+# Per-index results appended as batches finish, so an interrupted run can
+# resume without rewriting USE_CASES_PATH; folded into it at the end
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "use-cases.enrich.ckpt.jsonl")
+# Id of a submitted --batch job and the use cases in each of its requests,
+# so an interrupted run collects that batch instead of paying for another
+BATCH_STATE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "use-cases.enrich.batch.json")
 MODEL = "claude-sonnet-4-20250514"
-DELAY_SECONDS = 1
-BATCH_SIZE = 50
+MAX_CONCURRENT = 5  # In-flight API calls
+MAX_TOKENS = 4000
+BATCH_SIZE = 50  # First batch; later ones are sized from its output token usage
+MIN_BATCH_SIZE = 25
+MAX_BATCH_SIZE = 200
+BATCH_POLL_SECONDS = 30  # How often --batch checks whether the batch has ended
+MAX_ATTEMPTS = 8
+JSON_REMINDER = "\n\nReturn valid JSON only: a single JSON array and nothing else."
+MAX_RETRY_DELAY_SECONDS = 60
+# Share of use cases flagged as picks: 25-30 out of ~375 overall
+PICK_RATE = 0.075
+# Timeout, conflict, rate limited and any 5xx (including 529 overloaded):
+# the same set the SDK's own retries cover
+RETRYABLE_STATUS = (408, 409, 429)
 
 INTENTS = [
     "ship-faster",
@@ -43,7 +74,7 @@ SYSTEM_PROMPT = """You are an expert curator of AI use cases. You will be given
    - "level-up" — learning, growing, getting better at your craft
    - "think-strategically" — planning, decision-making, seeing the big picture
 
-2. **Flag the standout picks** — use cases that are especially useful, surprising, creative, or broadly applicable. Across ALL batches combined, we want roughly 25-30 total picks out of ~375 use cases, so flag about 3-4 per batch of 50. For each pick, write a short (1 sentence) reason explaining why it stands out.
+2. **Flag the standout picks** — use cases that are especially useful, surprising, creative, or broadly applicable. Across ALL batches combined, we want roughly 25-30 total picks out of ~375 use cases; each batch says how many of its use cases to flag. For each pick, write a short (1 sentence) reason explaining why it stands out.
 
 Be thoughtful about intent assignment. A use case can have 1 or 2 intents, but every use case must have at least 1. Choose the most fitting — don't default to "ship-faster" for everything."""
 
@@ -52,7 +83,7 @@ ENRICHMENT_PROMPT = """Here is a batch of use cases. For each one, return a JSON
 Each object should have:
 - "index": the use case's index number (as provided)
 - "intents": array of 1-2 intent tags from the allowed set
-- "is_pick": boolean — true only for the ~3-4 most standout use cases in this batch
+- "is_pick": boolean — true only for the most standout use cases in this batch (see PICKS below)
 - "pick_reason": a short sentence explaining why this stands out (null if is_pick is false)
 
 Return ONLY a valid JSON array, no markdown fencing, no explanation.
@@ -63,11 +94,38 @@ USE CASES:
 """
 
 
-def format_batch(use_cases: List[Dict[str, Any]], start_idx: int) -> str:
-    """Format a batch of use cases for the prompt."""
+def dump_json(data: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def pick_instruction(batch_len: int) -> str:
+    """How many picks to ask for in a batch of batch_len, at PICK_RATE."""
+    target = round(batch_len * PICK_RATE)
+    if target == 0:
+        return "PICKS: flag at most one of these, and only if it clearly stands out."
+    return "PICKS: flag about %d of these %d use cases." % (target, batch_len)
+
+
+def format_batch(use_cases: List[Dict[str, Any]], indices: List[int]) -> str:
+    """Format the use cases at `indices` for the prompt, followed by the pick target.
+
+    The target goes here rather than in the shared prompts, since batch
+    sizes vary and those prompts have to stay identical to be cached.
+    """
     lines = []
-    for i, uc in enumerate(use_cases):
-        idx = start_idx + i
+    for idx in indices:
+        uc = use_cases[idx]
         lines.append(
             "[%d] %s | %s | Category: %s | Audience: %s | Tools: %s"
             % (
@@ -79,49 +137,521 @@ def format_batch(use_cases: List[Dict[str, Any]], start_idx: int) -> str:
                 ", ".join((uc.get("tools") or [])[:5]),
             )
         )
+    lines.append("")
+    lines.append(pick_instruction(len(indices)))
     return "\n".join(lines)
 
 
-def enrich_batch(
-    client: anthropic.Anthropic,
-    use_cases: List[Dict[str, Any]],
-    start_idx: int,
-) -> List[Dict[str, Any]]:
-    """Send a batch to Claude and get enrichment data back."""
-    batch_text = format_batch(use_cases, start_idx)
+def request_params(batch_text: str, reminder: bool = False) -> Dict[str, Any]:
+    """messages.create arguments for enriching one formatted batch.
+
+    With reminder=True the prompt ends with JSON_REMINDER, for re-asking after
+    an unparseable reply.
+    """
+    if reminder:
+        batch_text += JSON_REMINDER
+    return {
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS,
+        "temperature": 0,
+        # Both prompts are identical for every batch, so mark them as a
+        # cacheable prefix; only the batch itself varies between calls.
+        # Together they are only ~450 tokens, under the 1024-token minimum
+        # cacheable prefix, so for now the API ignores the markers; they take
+        # effect once the prompts grow past it.
+        "system": [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+        ],
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": ENRICHMENT_PROMPT, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": batch_text},
+                ],
+            }
+        ],
+    }
+
+
+def extract_json_array(text: str) -> Optional[str]:
+    """Return the first balanced [...] region in text, or None.
+
+    Tracks string literals (and backslash escapes inside them) so brackets
+    within strings don't affect the depth count.
+    """
+    start = text.find("[")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def parse_results(text: str, label: str) -> Optional[List[Dict[str, Any]]]:
+    """Parse Claude's reply into a list of enrichment results (None if invalid).
+
+    Falls back to the outermost [...] region when the reply has prose around
+    the JSON or a stray/missing code fence.
+    """
+    text = text.strip()
+
+    # Remove markdown fencing if present
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1]
+        if text.endswith("```"):
+            text = text[:-3]
+        text = text.strip()
 
     try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=4000,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {"role": "user", "content": ENRICHMENT_PROMPT + batch_text}
-            ],
-        )
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        error = e
+
+    region = extract_json_array(text)
+    if region is not None:
+        try:
+            return json.loads(region)
+        except json.JSONDecodeError as e:
+            error = e
+
+    print("  [%s] JSON parse error: %s" % (label, error))
+    print("  [%s] Raw response: %s..." % (label, text[:300]))
+    return None
+
+
+def retry_delay(attempt: int, error: Exception) -> float:
+    """Seconds to wait before the next attempt: Retry-After if sent, else capped backoff with jitter."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            retry_after = int(response.headers.get("retry-after", 0))
+        except ValueError:
+            retry_after = 0
+        if retry_after > 0:
+            return retry_after
+    return min(MAX_RETRY_DELAY_SECONDS, 2 ** attempt + random.random())
+
+
+async def create_with_retry(
+    client: anthropic.AsyncAnthropic,
+    label: str,
+    **kwargs: Any
+) -> Any:
+    """Call messages.create, retrying connection errors, 408/409/429 and any 5xx.
+
+    Anything else (bad request, auth) is raised on the first failure. The SDK's
+    own retries are off for this call only, so they don't stack with these.
+    """
+    messages = client.with_options(max_retries=0).messages
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return await messages.create(**kwargs)
+        except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+            retryable = (
+                isinstance(e, anthropic.APIConnectionError)  # Includes APITimeoutError
+                or e.status_code in RETRYABLE_STATUS
+                or e.status_code >= 500
+            )
+            if not retryable or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = retry_delay(attempt, e)
+            print("  [%s] %s, retrying in %.1fs..." % (label, type(e).__name__, delay))
+            await asyncio.sleep(delay)
 
-        text = response.content[0].text.strip()
 
-        # Remove markdown fencing if present
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
+async def enrich_batch(
+    client: anthropic.AsyncAnthropic,
+    use_cases: List[Dict[str, Any]],
+    indices: List[int],
+) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Send the use cases at `indices` to Claude and get enrichment data back.
 
-        results = json.loads(text)
-        return results
+    Returns (results, output_tokens, truncated); truncated means the reply
+    hit MAX_TOKENS, so the batch was too big to answer in full.
+    """
+    batch_text = format_batch(use_cases, indices)
+    label = "batch-%d" % indices[0]
+
+    try:
+        response = await create_with_retry(client, label, **request_params(batch_text))
+        if response.stop_reason == "max_tokens":
+            return [], response.usage.output_tokens, True
+        results = parse_results(response.content[0].text, label)
+        if results is None:
+            print("  [%s] Re-asking once for valid JSON..." % label)
+            response = await create_with_retry(client, label, **request_params(batch_text, reminder=True))
+            results = parse_results(response.content[0].text, label)
+        return results or [], response.usage.output_tokens, False
 
-    except json.JSONDecodeError as e:
-        print("  JSON parse error: %s" % e)
-        print("  Raw response: %s..." % text[:300])
-        return []
     except anthropic.APIError as e:
-        print("  API error: %s" % e)
-        return []
+        print("  [%s] API error: %s" % (label, e))
+        return [], 0, False
     except Exception as e:
-        print("  Unexpected error: %s" % e)
-        return []
+        print("  [%s] Unexpected error: %s" % (label, e))
+        return [], 0, False
+
+
+def check_results(
+    indices: List[int],
+    results: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Drop results for use cases that weren't in the batch.
+
+    Returns (kept_results, missing_indices), the latter being batch indices
+    that got no result.
+    """
+    expected = set(indices)
+    kept = [
+        r for r in results
+        if isinstance(r, dict) and isinstance(r.get("index"), int) and r["index"] in expected
+    ]
+    missing = expected.difference(r["index"] for r in kept)
+    return kept, sorted(missing)
+
+
+def adaptive_batch_size(output_tokens: int, batch_len: int) -> int:
+    """Batch size whose replies should fill about 80% of MAX_TOKENS, clamped."""
+    tokens_per_item = max(1.0, output_tokens / batch_len)
+    size = int(MAX_TOKENS * 0.8 / tokens_per_item)
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, size))
+
+
+async def collect_batch(
+    client: anthropic.AsyncAnthropic,
+    batch_id: str,
+    batch_indices: Dict[str, List[int]],
+) -> List[Dict[str, Any]]:
+    """Poll a Message Batches job until it has ended and return its results.
+
+    batch_indices maps each custom_id to the use case indices it was sent;
+    results for use cases outside their request's batch are dropped.
+    """
+    batch = await client.messages.batches.retrieve(batch_id)
+    while batch.processing_status != "ended":
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch = await client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        print("  %d processing, %d succeeded, %d errored" % (counts.processing, counts.succeeded, counts.errored))
+
+    results = []
+    async for result in await client.messages.batches.results(batch_id):
+        if result.custom_id not in batch_indices:
+            continue
+        if result.result.type != "succeeded":
+            print("  %s: request %s — skipping." % (result.custom_id, result.result.type))
+            continue
+        parsed = parse_results(result.result.message.content[0].text, result.custom_id) or []
+        kept, missing = check_results(batch_indices[result.custom_id], parsed)
+        if missing:
+            print("  %s: %d use cases missing from the reply — skipping them." % (result.custom_id, len(missing)))
+        results.extend(kept)
+    return results
+
+
+def resumable_batch(
+    use_cases: List[Dict[str, Any]],
+    pending: List[int],
+    force: bool,
+) -> Optional[Tuple[str, Dict[str, List[int]]]]:
+    """Read BATCH_STATE_PATH, left by an interrupted --batch run, and drop it.
+
+    Returns (batch_id, batch_indices) limited to use cases in `pending`
+    whose title still matches, or None if there is nothing to resume. As
+    with the checkpoint, a forced run doesn't resume a batch submitted
+    without --force.
+    """
+    if not os.path.exists(BATCH_STATE_PATH):
+        return None
+    state = load_json(BATCH_STATE_PATH)
+    os.remove(BATCH_STATE_PATH)
+    if force and not state["force"]:
+        print("Discarding batch %s from an interrupted run without --force." % state["batch_id"])
+        return None
+
+    waiting = set(pending)
+    batch_indices = {
+        custom_id: [
+            idx for idx, title in entries
+            if idx in waiting and use_cases[idx].get("title") == title
+        ]
+        for custom_id, entries in state["batches"].items()
+    }
+    return state["batch_id"], batch_indices
+
+
+async def enrich_with_batch_api(
+    client: anthropic.AsyncAnthropic,
+    use_cases: List[Dict[str, Any]],
+    pending: List[int],
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Enrich the use cases at `pending` as one Message Batches job.
+
+    Batch requests cost half as much and run in parallel server-side, but
+    results can take a while; the batch is polled until it has ended. The
+    job's id is kept in BATCH_STATE_PATH meanwhile, and a job left there by
+    an interrupted run is collected before anything new is submitted.
+
+    Results are applied, and logged to CHECKPOINT_PATH, once a job ends.
+    Returns (applied_count, pick_count).
+    """
+    success_count = 0
+    pick_count = 0
+
+    with open(CHECKPOINT_PATH, "ab") as checkpoint:
+        resumed = resumable_batch(use_cases, pending, force)
+        if resumed is not None:
+            batch_id, batch_indices = resumed
+            print("Resuming batch %s from an interrupted run..." % batch_id)
+            try:
+                results = await collect_batch(client, batch_id, batch_indices)
+            except anthropic.NotFoundError:
+                print("  Batch %s no longer exists; its use cases will be resubmitted." % batch_id)
+            else:
+                success_count, pick_count = apply_results(use_cases, results, checkpoint, force)
+                sent = {idx for indices in batch_indices.values() for idx in indices}
+                pending = [i for i in pending if i not in sent]
+
+        # Submitted all at once, so there is no first reply to size batches from
+        batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+        if not batches:
+            return success_count, pick_count
+
+        batch_indices = {"batch-%d" % indices[0]: indices for indices in batches}
+        requests = [
+            {
+                "custom_id": custom_id,
+                "params": request_params(format_batch(use_cases, indices)),
+            }
+            for custom_id, indices in batch_indices.items()
+        ]
+        batch = await client.messages.batches.create(requests=requests)
+        # Saved before polling; titles let a resumed run spot a regenerated file
+        state = {
+            "batch_id": batch.id,
+            "force": force,
+            "batches": {
+                custom_id: [[idx, use_cases[idx].get("title")] for idx in indices]
+                for custom_id, indices in batch_indices.items()
+            },
+        }
+        with open(BATCH_STATE_PATH + ".tmp", "wb") as f:
+            f.write(dump_json(state))
+        os.replace(BATCH_STATE_PATH + ".tmp", BATCH_STATE_PATH)
+        print("Submitted batch %s with %d requests; polling..." % (batch.id, len(requests)))
+
+        results = await collect_batch(client, batch.id, batch_indices)
+        applied, picks = apply_results(use_cases, results, checkpoint, force)
+        # Every result is now in the checkpoint
+        os.remove(BATCH_STATE_PATH)
+
+    return success_count + applied, pick_count + picks
+
+
+ENRICHED_FIELDS = ("intents", "is_pick", "pick_reason")
+
+
+def save_use_cases(use_cases: List[Dict[str, Any]]) -> None:
+    """Write use_cases to USE_CASES_PATH atomically and drop the checkpoint it now covers."""
+    tmp_path = USE_CASES_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_json(use_cases, pretty=True))
+    os.replace(tmp_path, USE_CASES_PATH)
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
+
+def replay_checkpoint(use_cases: List[Dict[str, Any]], force: bool) -> Set[int]:
+    """Apply results logged to CHECKPOINT_PATH by an interrupted run.
+
+    Lines whose title no longer matches the use case at that index (the
+    file was regenerated since) are ignored. A forced run also ignores lines
+    logged by a run without --force, so those use cases are redone; any
+    run's results count for a run that isn't forced. Returns the indices
+    applied.
+    """
+    replayed = set()
+    if not os.path.exists(CHECKPOINT_PATH):
+        return replayed
+
+    with open(CHECKPOINT_PATH, "rb") as f:
+        for line in f:
+            try:
+                record = orjson.loads(line) if orjson else json.loads(line)
+            except ValueError:
+                continue  # Partial last line from a crash
+            idx = record["index"]
+            if idx >= len(use_cases) or use_cases[idx].get("title") != record["title"]:
+                continue
+            if force and not record.get("force"):
+                continue
+            for field in ENRICHED_FIELDS:
+                use_cases[idx][field] = record[field]
+            replayed.add(idx)
+    return replayed
+
+
+def apply_results(
+    use_cases: List[Dict[str, Any]],
+    results: List[Dict[str, Any]],
+    checkpoint: Optional[BinaryIO] = None,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Write intents and picks from Claude's results into use_cases.
+
+    Each applied result is also appended to `checkpoint`, if given, tagged
+    with whether this is a --force run.
+    Returns (applied_count, pick_count).
+    """
+    success_count = 0
+    pick_count = 0
+
+    for r in results:
+        idx = r.get("index")
+        if idx is None or idx < 0 or idx >= len(use_cases):
+            continue
+
+        intents = r.get("intents", [])
+        # Validate intents
+        valid_intents = [i for i in intents if i in INTENTS]
+        if not valid_intents:
+            valid_intents = ["get-inspired"]  # Fallback
+
+        use_cases[idx]["intents"] = valid_intents
+        use_cases[idx]["is_pick"] = bool(r.get("is_pick", False))
+        use_cases[idx]["pick_reason"] = (
+            r.get("pick_reason") if r.get("is_pick") else None
+        )
+
+        if checkpoint is not None:
+            record = {"index": idx, "title": use_cases[idx].get("title"), "force": force}
+            for field in ENRICHED_FIELDS:
+                record[field] = use_cases[idx][field]
+            checkpoint.write(dump_json(record) + b"\n")
+
+        success_count += 1
+        if use_cases[idx]["is_pick"]:
+            pick_count += 1
+
+    if checkpoint is not None:
+        checkpoint.flush()
+    return success_count, pick_count
+
+
+async def enrich_concurrently(
+    client: anthropic.AsyncAnthropic,
+    use_cases: List[Dict[str, Any]],
+    pending: List[int],
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Enrich the use cases at `pending` with up to MAX_CONCURRENT requests in flight.
+
+    A first batch of BATCH_SIZE is sent alone; the rest are then sized from
+    the output tokens it used per use case. A batch whose reply is cut off
+    at MAX_TOKENS is split in half and both halves are sent again. Use cases
+    a reply skips are sent once more in a small remedial batch.
+
+    Results are applied, and logged to CHECKPOINT_PATH, as each batch completes.
+    Returns (applied_count, pick_count).
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    queue = collections.deque(pending)
+    running = set()
+    batch_size = BATCH_SIZE
+    probing = True  # Until a first batch comes back whole
+    remedial = set()  # Indices already re-sent after a reply skipped them
+
+    async def run(indices):
+        async with sem:
+            return indices, await enrich_batch(client, use_cases, indices)
+
+    def dispatch(size):
+        indices = [queue.popleft() for _ in range(min(size, len(queue)))]
+        running.add(asyncio.ensure_future(run(indices)))
+
+    success_count = 0
+    pick_count = 0
+    done_count = 0
+
+    with open(CHECKPOINT_PATH, "ab") as checkpoint:
+        if queue:
+            dispatch(batch_size)
+        while running:
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                indices, (results, output_tokens, truncated) = task.result()
+
+                if truncated and len(indices) > 1:
+                    half = len(indices) // 2
+                    batch_size = min(batch_size, half)
+                    print(
+                        "  [batch-%d] Reply cut off at %d tokens; retrying as two batches of ~%d"
+                        % (indices[0], MAX_TOKENS, half)
+                    )
+                    queue.extendleft(reversed(indices))
+                    dispatch(half)
+                    dispatch(len(indices) - half)
+                    continue
+
+                first_batch = probing
+                probing = False
+
+                if not results:
+                    done_count += len(indices)
+                    print(
+                        "[%d/%d] Failed %d use cases starting at #%d — skipping batch."
+                        % (done_count, len(pending), len(indices), indices[0])
+                    )
+                    continue
+
+                results, missing = check_results(indices, results)
+                retry = [idx for idx in missing if idx not in remedial]
+                done_count += len(indices) - len(retry)
+                print(
+                    "[%d/%d] Enriched %d use cases starting at #%d"
+                    % (done_count, len(pending), len(indices) - len(missing), indices[0])
+                )
+                if retry:
+                    print("  %d use cases missing from the reply; re-sending them" % len(retry))
+                    remedial.update(retry)
+                    queue.extendleft(reversed(retry))
+                    dispatch(len(retry))
+                elif missing:
+                    print("  %d use cases still missing after a retry — skipping them." % len(missing))
+
+                if first_batch:
+                    batch_size = adaptive_batch_size(output_tokens, len(indices))
+                    print("  Using batches of %d from here on" % batch_size)
+
+                applied, picks = apply_results(use_cases, results, checkpoint, force)
+                success_count += applied
+                pick_count += picks
+
+            # The rest goes out once the first batch has come back
+            while queue and not probing:
+                dispatch(batch_size)
+
+    return success_count, pick_count
 
 
 def main():
@@ -131,18 +661,26 @@ def main():
         sys.exit(1)
 
     force = "--force" in sys.argv
-    client = anthropic.Anthropic(api_key=api_key)
+    use_batch = "--batch" in sys.argv
+    # messages.create goes through create_with_retry, which honors Retry-After;
+    # the batch API calls keep the SDK's retries
+    client = anthropic.AsyncAnthropic(api_key=api_key)
 
     # Load use cases
     if not os.path.exists(USE_CASES_PATH):
         print("ERROR: %s not found. Run analyze.py first." % USE_CASES_PATH)
         sys.exit(1)
 
-    with open(USE_CASES_PATH, "r", encoding="utf-8") as f:
-        use_cases = json.load(f)
+    use_cases = load_json(USE_CASES_PATH)
 
     print("Loaded %d use cases." % len(use_cases))
 
+    # Pick up results from an interrupted run (only an interrupted forced
+    # run, if forcing)
+    replayed = replay_checkpoint(use_cases, force)
+    if replayed:
+        print("Resumed %d enriched use cases from %s" % (len(replayed), CHECKPOINT_PATH))
+
     # Check if already enriched
     already_enriched = sum(1 for uc in use_cases if uc.get("intents"))
     if already_enriched > 0 and not force:
@@ -152,65 +690,29 @@ def main():
         )
         if already_enriched == len(use_cases):
             print("All use cases already enriched. Nothing to do.")
+            if replayed:
+                save_use_cases(use_cases)
             return
 
-    # Process in batches
-    total_batches = (len(use_cases) + BATCH_SIZE - 1) // BATCH_SIZE
+    # Process in batches of the use cases still needing work (all not yet
+    # redone by this run, if forcing). Without --force that is usually just
+    # the week's new use cases, often a single small batch; its PICKS line is
+    # scaled to its size, so a handful of new use cases gets at most one pick.
+    if force:
+        pending = [i for i in range(len(use_cases)) if i not in replayed]
+    else:
+        pending = [i for i, uc in enumerate(use_cases) if not uc.get("intents")]
     pick_count = 0
     success_count = 0
 
-    for batch_num in range(total_batches):
-        start = batch_num * BATCH_SIZE
-        end = min(start + BATCH_SIZE, len(use_cases))
-        batch = use_cases[start:end]
-
-        # Skip already-enriched unless forcing
-        if not force and all(uc.get("intents") for uc in batch):
-            print(
-                "[Batch %d/%d] Skipping — already enriched."
-                % (batch_num + 1, total_batches)
-            )
-            continue
-
-        print(
-            "[Batch %d/%d] Enriching use cases %d-%d..."
-            % (batch_num + 1, total_batches, start, end - 1)
-        )
-
-        results = enrich_batch(client, batch, start)
-
-        if not results:
-            print("  Failed — skipping batch.")
-            continue
-
-        # Apply results
-        for r in results:
-            idx = r.get("index")
-            if idx is None or idx < 0 or idx >= len(use_cases):
-                continue
-
-            intents = r.get("intents", [])
-            # Validate intents
-            valid_intents = [i for i in intents if i in INTENTS]
-            if not valid_intents:
-                valid_intents = ["get-inspired"]  # Fallback
-
-            use_cases[idx]["intents"] = valid_intents
-            use_cases[idx]["is_pick"] = bool(r.get("is_pick", False))
-            use_cases[idx]["pick_reason"] = (
-                r.get("pick_reason") if r.get("is_pick") else None
-            )
-
-            success_count += 1
-            if use_cases[idx]["is_pick"]:
-                pick_count += 1
-
-        # Save after each batch
-        with open(USE_CASES_PATH, "w", encoding="utf-8") as f:
-            json.dump(use_cases, f, indent=2, ensure_ascii=False)
+    if use_batch:
+        success_count, pick_count = asyncio.run(enrich_with_batch_api(client, use_cases, pending, force))
+    else:
+        print("Enriching %d use cases with up to %d concurrent requests..." % (len(pending), MAX_CONCURRENT))
+        success_count, pick_count = asyncio.run(enrich_concurrently(client, use_cases, pending, force))
 
-        if batch_num < total_batches - 1:
-            time.sleep(DELAY_SECONDS)
+    # Written once, with everything from this run and any replayed checkpoint
+    save_use_cases(use_cases)
 
     # Summary
     intent_counts = {}